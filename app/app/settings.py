@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/3.2/ref/settings/
 """
 
 import os
+import sys
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -90,6 +91,23 @@ DATABASES = {
         "HOST": os.environ.get("DB_HOST"),
         "USER": os.environ.get("DB_USER"),
         "PASSWORD": os.environ.get("DB_PASSWORD"),  # Fix the variable name here
+        # Reuse connections across requests instead of reconnecting each time
+        "CONN_MAX_AGE": int(os.environ.get("DB_CONN_MAX_AGE", 60)),
+    }
+}
+
+
+# Cache
+# https://docs.djangoproject.com/en/4.0/topics/cache/
+
+# Cached tag/ingredient lists are invalidated through the cache itself, so
+# every uwsgi worker must share it; without REDIS_URL nothing is cached.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": os.environ.get("REDIS_URL"),
+    } if os.environ.get("REDIS_URL") else {
+        "BACKEND": "django.core.cache.backends.dummy.DummyCache",
     }
 }
 
@@ -113,6 +131,42 @@ AUTH_PASSWORD_VALIDATORS = [
 ]
 
 
+# Cheaper password hashing, database free sessions and an in-memory
+# database while running tests
+# https://docs.djangoproject.com/en/3.2/topics/testing/overview/#password-hashing
+
+TEST_RUNNER = "core.test_runner.ParallelDiscoverRunner"
+
+TESTING = 'test' in sys.argv or bool(int(os.environ.get('DJANGO_TEST', 0)))
+
+if TESTING:
+    PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
+    SESSION_ENGINE = "django.contrib.sessions.backends.signed_cookies"
+    # Test rollbacks don't reach the cache, so nothing may be cached between
+    # tests; tests of caching itself override this with a local memory cache
+    CACHES = {
+        "default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}
+    }
+
+    # TEST_WITH_POSTGRES=1 keeps the Postgres database (and its migrations)
+    # for integration runs such as CI.
+    if not bool(int(os.environ.get('TEST_WITH_POSTGRES', 0))):
+        DATABASES = {
+            "default": {
+                "ENGINE": "django.db.backends.sqlite3",
+                "NAME": ":memory:",
+                # Build tables straight from the models instead of replaying
+                # every migration when the test database is created
+                "TEST": {"MIGRATE": False},
+            }
+        }
+
+    # FAST_PASSWORDS=1 skips hashing entirely; leave it unset when working on
+    # anything that depends on real password hashing semantics.
+    if bool(int(os.environ.get('FAST_PASSWORDS', 0))):
+        PASSWORD_HASHERS = ["core.tests.hashers.PlainPasswordHasher"]
+
+
 # Internationalization
 # https://docs.djangoproject.com/en/3.2/topics/i18n/
 
@@ -70,6 +70,9 @@ class Recipe(models.Model):
     ingredients = models.ManyToManyField('Ingredient')
     image = models.ImageField(null=True, upload_to=recipe_image_file_path)
 
+    class Meta:
+        indexes = [models.Index(fields=['user', '-id'])]
+
     def __str__(self):
         return self.title
 
@@ -98,5 +101,8 @@ class Ingredient(models.Model):
         on_delete=models.CASCADE,
     )
 
+    class Meta:
+        indexes = [models.Index(fields=['user', 'name'])]
+
     def __str__(self):
         return self.name
@@ -0,0 +1,17 @@
+"""Custom test runner for the project"""
+
+from importlib.util import find_spec
+
+from django.test.runner import DiscoverRunner
+
+
+class ParallelDiscoverRunner(DiscoverRunner):
+    """Runs the test suite with one process per CPU unless told otherwise"""
+
+    @classmethod
+    def add_arguments(cls, parser):
+        super().add_arguments(parser)
+        # Failures can only be sent back from worker processes when tblib
+        # can pickle their tracebacks, so stay serial without it
+        if find_spec('tblib') is not None:
+            parser.set_defaults(parallel='auto')
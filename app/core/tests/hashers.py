@@ -0,0 +1,38 @@
+"""Password hashers used only by the test suite"""
+
+from django.contrib.auth.hashers import BasePasswordHasher, mask_hash
+from django.utils.crypto import constant_time_compare
+from django.utils.translation import gettext_noop as _
+
+
+class PlainPasswordHasher(BasePasswordHasher):
+    """Stores passwords as plain text; never use outside of tests"""
+
+    algorithm = 'plain'
+
+    def salt(self):
+        return ''
+
+    def encode(self, password, salt):
+        return f'{self.algorithm}${password}'
+
+    def decode(self, encoded):
+        algorithm, password = encoded.split('$', 1)
+        return {
+            'algorithm': algorithm,
+            'hash': password,
+            'salt': None,
+        }
+
+    def verify(self, password, encoded):
+        return constant_time_compare(encoded, self.encode(password, ''))
+
+    def safe_summary(self, encoded):
+        decoded = self.decode(encoded)
+        return {
+            _('algorithm'): decoded['algorithm'],
+            _('hash'): mask_hash(decoded['hash'], show=0),
+        }
+
+    def harden_runtime(self, password, encoded):
+        pass
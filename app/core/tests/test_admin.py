@@ -4,29 +4,35 @@ from django.test import TestCase, Client
 from django.contrib.auth import get_user_model
 from django.urls import reverse
 
+User = get_user_model()
+
+USER_CHANGELIST_URL = reverse('admin:core_user_changelist')
+USER_ADD_URL = reverse('admin:core_user_add')
+
 
 class AdminSiteTests(TestCase):
     """Admin site tests class"""
 
-    def setUp(self):
-        """Set up method"""
-        self.client = Client()
-        self.admin_user = get_user_model().objects.create_superuser(
+    @classmethod
+    def setUpTestData(cls):
+        """Create the users shared by every test in the class"""
+        cls.admin_user = User.objects.create_superuser(
             email='admin@email.com',
             password='Password123'
         )
-        self.client.force_login(self.admin_user)
-
-        self.user = get_user_model().objects.create_user(
+        cls.user = User.objects.create_user(
             email='user@email.com',
             password='Password123',
         )
 
+    def setUp(self):
+        """Set up method"""
+        self.client = Client()
+        self.client.force_login(self.admin_user)
+
     def test_users_listed(self):
         """Tests that users are listed on user page"""
-        url = reverse('admin:core_user_changelist')
-        print(url)
-        res = self.client.get(url)
+        res = self.client.get(USER_CHANGELIST_URL)
 
         self.assertContains(res, self.user.email)
         self.assertContains(res, self.admin_user.email)
@@ -40,7 +46,6 @@ class AdminSiteTests(TestCase):
 
     def test_add_user_page(self):
         """Tests that the add user page is working"""
-        url = reverse('admin:core_user_add')
-        res = self.client.get(url)
+        res = self.client.get(USER_ADD_URL)
 
         self.assertEqual(res.status_code, 200)
@@ -13,13 +13,15 @@ from django.test import SimpleTestCase
 class CommandTests(SimpleTestCase):
     """Test commands"""
 
-    def test_wait_for_db_ready(self, patched_check):
+    @patch('time.sleep')
+    def test_wait_for_db_ready(self, patched_sleep, patched_check):
         """Test waiting for db when db is available"""
         patched_check.return_value = True
 
         call_command('wait_for_db')
 
         patched_check.assert_called_once_with(databases=['default'])
+        patched_sleep.assert_not_called()
 
     @patch('time.sleep')
     def test_wait_for_db_delay(self, patched_sleep, patched_check):
@@ -30,4 +32,5 @@ class CommandTests(SimpleTestCase):
         call_command('wait_for_db')
 
         self.assertEqual(patched_check.call_count, 6)
+        self.assertEqual(patched_sleep.call_count, 5)
         patched_check.assert_called_with(databases=['default'])
@@ -1,16 +1,15 @@
 """Tests the health check API endpoint"""
 
-from django.test import TestCase
+from django.test import SimpleTestCase
 from django.urls import reverse
 from rest_framework import status
 from rest_framework.test import APIClient
 
 
-class HealthCheckTest(TestCase):
+class HealthCheckTest(SimpleTestCase):
     """Tests the health check API endpoint"""
 
-    def setUp(self):
-        self.client = APIClient()
+    client_class = APIClient
 
     def test_health_check(self):
         """Tests the health check API endpoint"""
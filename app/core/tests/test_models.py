@@ -8,6 +8,8 @@ from decimal import Decimal
 
 from unittest.mock import patch
 
+User = get_user_model()
+
 TEST_USER_DETAILS = {
     "email": "test@email.com",
     "password": "testpass",
@@ -23,12 +25,17 @@ def create_user(email='tester@email.com', password='Pass123'):
 class ModelTests(TestCase):
     """Model testing class"""
 
+    @classmethod
+    def setUpTestData(cls):
+        """Create the user shared by the tag and ingredient tests"""
+        cls.user = create_user()
+
     def test_create_user_with_email_successful(self):
         """Tests that creating a new user with an email is successful"""
         email = "test@email.com"
         password = "Password123"
 
-        user = get_user_model().objects.create_user(email=email, password=password)
+        user = User.objects.create_user(email=email, password=password)
 
         self.assertEqual(user.email, email)
         self.assertTrue(user.check_password(password))
@@ -44,17 +51,18 @@ class ModelTests(TestCase):
         ]
 
         for email, normalized_email in sample_emails:
-            user = get_user_model().objects.create_user(email, "Password123")
-            self.assertEqual(user.email, normalized_email)
+            with self.subTest(email=email):
+                user = User.objects.create_user(email, "Password123")
+                self.assertEqual(user.email, normalized_email)
 
     def test_new_user_without_email_raise_value_error(self):
         """Tests that creating a user without an email raises ValeError"""
         with self.assertRaises(ValueError):
-            get_user_model().objects.create_user("", "Password123")
+            User.objects.create_user("", "Password123")
 
     def test_create_super_user(self):
         """Tests that super users are created correctly"""
-        user = get_user_model().objects.create_superuser(
+        user = User.objects.create_superuser(
             "super@email.com", "Password123"
         )
 
@@ -63,7 +71,7 @@ class ModelTests(TestCase):
 
     def test_recipe_model_create_success(self):
         """Tests that a recipe is created successfully"""
-        user = get_user_model().objects.create_user(**TEST_USER_DETAILS)
+        user = User.objects.create_user(**TEST_USER_DETAILS)
 
         recipe = models.Recipe.objects.create(
             title="Test Recipe",
@@ -77,15 +85,13 @@ class ModelTests(TestCase):
 
     def test_create_tag(self):
         """Tests creating a new tag"""
-        user = create_user()
-        tag = models.Tag.objects.create(user=user, name='Test Tag')
+        tag = models.Tag.objects.create(user=self.user, name='Test Tag')
 
         self.assertEqual(str(tag), tag.name)
 
     def test_create_ingredient(self):
         """Test creating a new ingredient"""
-        user = create_user()
-        ingredient = models.Ingredient.objects.create(user=user, name='Salt')
+        ingredient = models.Ingredient.objects.create(user=self.user, name='Salt')
 
         self.assertEqual(str(ingredient), ingredient.name)
 
@@ -7,20 +7,38 @@ from core.models import Recipe, Tag, Ingredient
 
 class TagSerializer(serializers.ModelSerializer):
     """Tag Serializer"""
+
     class Meta:
         model = Tag
         fields = ['id', 'name']
         read_only_fields = ['id']
 
 
+class TagListSerializer(TagSerializer):
+    """Serializer for the tag list, flagging tags used by a recipe"""
+    is_assigned = serializers.BooleanField(read_only=True)
+
+    class Meta(TagSerializer.Meta):
+        fields = TagSerializer.Meta.fields + ['is_assigned']
+
+
 class IngredientSerializer(serializers.ModelSerializer):
     """Ingredient Serializer"""
+
     class Meta:
         model = Ingredient
         fields = ['id', 'name']
         read_only_fields = ['id']
 
 
+class IngredientListSerializer(IngredientSerializer):
+    """Serializer for the ingredient list, flagging ingredients used by a recipe"""
+    is_assigned = serializers.BooleanField(read_only=True)
+
+    class Meta(IngredientSerializer.Meta):
+        fields = IngredientSerializer.Meta.fields + ['is_assigned']
+
+
 class RecipeSerializer(serializers.ModelSerializer):
     """Recipe serializer"""
     tags = TagSerializer(many=True, required=False)
@@ -34,10 +52,21 @@ class RecipeSerializer(serializers.ModelSerializer):
     def _get_or_create_tags(self, tags, recipe):
         """Gets or create recipe tags"""
         auth_user = self.context['request'].user
-
-        for tag in tags:
-            tag_obj, created = Tag.objects.get_or_create(user=auth_user, **tag)
-            recipe.tags.add(tag_obj)
+        # Dedupe while keeping payload order so new tags get IDs in that order
+        names = dict.fromkeys(tag['name'] for tag in tags)
+
+        if not names:
+            return
+
+        existing = set(
+            Tag.objects.filter(user=auth_user, name__in=names)
+            .values_list('name', flat=True)
+        )
+        Tag.objects.bulk_create(
+            [Tag(user=auth_user, name=name) for name in names if name not in existing],
+            ignore_conflicts=True,
+        )
+        recipe.tags.add(*Tag.objects.filter(user=auth_user, name__in=names))
 
     def _get_or_create_ingredients(self, ingreidients, recipe):
         """Handles get or create recipe ingredients"""
@@ -1,7 +1,10 @@
 """Ingredient testing module"""
 
+from functools import lru_cache
+
+from django.db.models import Value
 from django.urls import reverse
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase
 
 from rest_framework.test import APIClient
 from rest_framework import status
@@ -10,46 +13,42 @@ from decimal import Decimal
 
 from core.models import Ingredient
 
-from recipe.serializers import IngredientSerializer
+from recipe.serializers import IngredientListSerializer
 
 from recipe.tests.utils import (
     create_recipe,
     create_ingredient,
-    create_user,
-    drop_ingredients,
-    drop_users,
-    drop_recipes
+    create_user
 )
 
 INGREDIENTS_URL = reverse('recipe:ingredient-list')
 
 
+@lru_cache(maxsize=None)
 def detail_url(ingredient_id):
     """Return ingredient detail URL"""
     return reverse('recipe:ingredient-detail', args=[ingredient_id])
 
 
-class PublicIngredientAPITest(TestCase):
+class PublicIngredientAPITest(SimpleTestCase):
     """Test unathenticated ingredients requests"""
-    def setUp(self):
-        self.client = APIClient()
+    client_class = APIClient
 
     def test_auth_required(self):
         """Test that authentication is required for access"""
         res = self.client.get(INGREDIENTS_URL)
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
-    def tearDown(self):
-        drop_users()
-        drop_recipes()
-
 
 class PrivateIngredientAPITest(TestCase):
     """Test authenticated ingredients requests"""
-    def setUp(self):
-        self.client = APIClient()
-        self.user = create_user(email='test@email.com', password='Password1234')
+    client_class = APIClient
 
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(email='test@email.com', password='Password1234')
+
+    def setUp(self):
         self.client.force_authenticate(self.user)
 
     def test_retrieve_ingredients(self):
@@ -57,11 +56,14 @@ class PrivateIngredientAPITest(TestCase):
         create_ingredient(user=self.user, name='Curry')
         create_ingredient(user=self.user, name='Maggi')
 
-        res = self.client.get(INGREDIENTS_URL)
+        with self.assertNumQueries(1):
+            res = self.client.get(INGREDIENTS_URL)
         self.assertEqual(res.status_code, status.HTTP_200_OK)
 
-        ingredients = Ingredient.objects.all().order_by('-name')
-        serializer = IngredientSerializer(ingredients, many=True)
+        ingredients = Ingredient.objects.annotate(
+            is_assigned=Value(False)
+        ).order_by('-name')
+        serializer = IngredientListSerializer(ingredients, many=True)
 
         self.assertEqual(res.data, serializer.data)
 
@@ -97,7 +99,7 @@ class PrivateIngredientAPITest(TestCase):
         res = self.client.delete(url)
 
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
-        self.assertEqual(Ingredient.objects.filter(id=ingredient.id).count(), 0)
+        self.assertFalse(Ingredient.objects.filter(pk=ingredient.id).exists())
 
     def test_filter_assigned(self):
         """Test filtering ingredients by those assigned to a recipe"""
@@ -108,12 +110,14 @@ class PrivateIngredientAPITest(TestCase):
 
         recipe.ingredients.add(ing1)
 
-        res = self.client.get(INGREDIENTS_URL, params)
+        with self.assertNumQueries(1):
+            res = self.client.get(INGREDIENTS_URL, params)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
 
-        s1 = IngredientSerializer(ing1)
-        s2 = IngredientSerializer(ing2)
+        ing1.is_assigned, ing2.is_assigned = True, False
+        s1 = IngredientListSerializer(ing1)
+        s2 = IngredientListSerializer(ing2)
 
         self.assertIn(s1.data, res.data)
         self.assertNotIn(s2.data, res.data)
@@ -129,12 +133,8 @@ class PrivateIngredientAPITest(TestCase):
         recipe2.ingredients.add(ing1)
         params = {'assigned_only': 1}
 
-        res = self.client.get(INGREDIENTS_URL, params)
+        with self.assertNumQueries(1):
+            res = self.client.get(INGREDIENTS_URL, params)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(len(res.data), 1)
-
-    def tearDown(self):
-        drop_ingredients()
-        drop_users()
-        drop_recipes()
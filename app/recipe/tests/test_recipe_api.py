@@ -1,6 +1,7 @@
 """Test module for the recipe API"""
 
-from django.test import TestCase
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase, TestCase, override_settings
 from django.urls import reverse
 
 from rest_framework import status
@@ -9,8 +10,11 @@ from rest_framework.test import APIClient
 from core.models import Recipe, Tag, Ingredient
 from decimal import Decimal
 
-import tempfile
+import io
 import os
+from functools import lru_cache
+import shutil
+import tempfile
 from PIL import Image
 
 from recipe.serializers import (
@@ -20,33 +24,31 @@ from recipe.serializers import (
 
 from recipe.tests.utils import (
     create_recipe,
+    create_recipes,
     create_tag,
     create_user,
-    TEST_RECIPE,
-    drop_recipes,
-    drop_tags,
-    drop_ingredients,
-    drop_users
+    TEST_RECIPE
 )
 
 RECIPES_URL = reverse("recipe:recipe-list")
 
 
+@lru_cache(maxsize=None)
 def get_recipe_detail_url(id):
     """Creates and returns a recipe detail URL"""
     return reverse("recipe:recipe-detail", args=[id])
 
 
+@lru_cache(maxsize=None)
 def image_upload_url(recipe_id):
     """Return URL for recipe image upload"""
     return reverse("recipe:recipe-upload-image", args=[recipe_id])
 
 
-class PublicRecipeAPITest(TestCase):
+class PublicRecipeAPITest(SimpleTestCase):
     """Test unauthenticated requests"""
 
-    def setUp(self):
-        self.client = APIClient()
+    client_class = APIClient
 
     def test_auth_required(self):
         """Test auth is required to make a request"""
@@ -54,28 +56,27 @@ class PublicRecipeAPITest(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
-    def tearDown(self):
-        Recipe.objects.all().delete()
-        drop_users()
-
 
 class PrivateRecipeAPITest(TestCase):
     """Test authenticated requests"""
 
-    def setUp(self):
-        self.client = APIClient()
-        self.user = create_user(email="test@email.com", password="testPassword")
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(email="test@email.com", password="testPassword")
 
+    def setUp(self):
         self.client.force_authenticate(self.user)
 
     def test_retrive_recipe(self):
         """Test that authenticated users can retrieve a list of recipes"""
-        create_recipe(self.user)
-        create_recipe(self.user)
+        create_recipes(self.user, 2)
 
-        res = self.client.get(RECIPES_URL)
+        with self.assertNumQueries(3):
+            res = self.client.get(RECIPES_URL)
 
-        recipes = Recipe.objects.all().order_by("-id")
+        recipes = Recipe.objects.prefetch_related("tags", "ingredients").order_by("-id")
         serializer = RecipeSerializer(recipes, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
@@ -90,18 +91,36 @@ class PrivateRecipeAPITest(TestCase):
 
         res = self.client.get(RECIPES_URL)
 
-        recipes = Recipe.objects.filter(user=self.user)
+        recipes = Recipe.objects.filter(user=self.user).prefetch_related(
+            "tags", "ingredients"
+        )
         serializer = RecipeSerializer(recipes, many=True)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data, serializer.data)
 
+    def test_recipe_list_matches_detail(self):
+        """Test a recipe is rendered alike in the list and its detail view"""
+        recipe = create_recipe(
+            user=self.user,
+            tags=[{"name": "Zeta"}, {"name": "Alpha"}],
+            ingredients=[{"name": "Yam"}, {"name": "Pepper"}],
+        )
+
+        list_res = self.client.get(RECIPES_URL)
+        detail_res = self.client.get(get_recipe_detail_url(recipe.id))
+
+        self.assertEqual(len(list_res.data), 1)
+        for key, value in list_res.data[0].items():
+            self.assertEqual(detail_res.data[key], value)
+
     def test_view_recipe_detail(self):
         """Test viewing a recipe detail"""
         recipe = create_recipe(user=self.user)
         url = get_recipe_detail_url(recipe.id)
 
-        res = self.client.get(url)
+        with self.assertNumQueries(3):
+            res = self.client.get(url)
         serializer = RecipeDetailSerializer(recipe)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
@@ -109,17 +128,20 @@ class PrivateRecipeAPITest(TestCase):
 
     def test_create_recipe(self):
         """Test that recipe gets created successfully"""
-        payload = TEST_RECIPE
+        payload = TEST_RECIPE.copy()
 
         res = self.client.post(RECIPES_URL, payload)
 
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
 
-        recipe = Recipe.objects.get(id=res.data["id"])
         for key, value in payload.items():
-            self.assertEqual(getattr(recipe, key), value)
+            self.assertEqual(
+                Decimal(res.data[key]) if key == "price" else res.data[key], value
+            )
 
-        self.assertEqual(recipe.user, self.user)
+        self.assertTrue(
+            Recipe.objects.filter(pk=res.data["id"], user=self.user).exists()
+        )
 
     def test_partial_update(self):
         """Tests partial update of a recipe works correctly"""
@@ -156,9 +178,10 @@ class PrivateRecipeAPITest(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
 
-        recipe.refresh_from_db()
         for key, value in payload.items():
-            self.assertEqual(getattr(recipe, key), value)
+            self.assertEqual(
+                Decimal(res.data[key]) if key == "price" else res.data[key], value
+            )
 
     def test_no_update_recipe_user(self):
         """Test that a recipe's user can't be updated"""
@@ -184,7 +207,7 @@ class PrivateRecipeAPITest(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
 
-        recipe_exists = Recipe.objects.filter(id=recipe.id).exists()
+        recipe_exists = Recipe.objects.filter(pk=recipe.id).exists()
 
         self.assertFalse(recipe_exists)
 
@@ -199,13 +222,13 @@ class PrivateRecipeAPITest(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_404_NOT_FOUND)
 
-        recipeExists = Recipe.objects.filter(id=recipe.id)
+        recipe_exists = Recipe.objects.filter(pk=recipe.id).exists()
 
-        self.assertTrue(recipeExists)
+        self.assertTrue(recipe_exists)
 
     def test_create_recipe_recipe_with_new_tags(self):
         """Test creating a reciper with new tags (Nested Serializer)"""
-        payload = TEST_RECIPE
+        payload = TEST_RECIPE.copy()
         payload['tags'] = [
             {"name": "Lunch"},
             {"name": "Heavy"}
@@ -219,17 +242,15 @@ class PrivateRecipeAPITest(TestCase):
         self.assertEqual(recipes.count(), 1)
         recipe = recipes.first()
 
-        self.assertEqual(recipe.tags.count(), 2)
-
-        tags = recipe.tags.all()
-
-        for tag in payload['tags']:
-            self.assertIn(Tag.objects.get(name=tag['name'], user=self.user), tags)
+        self.assertCountEqual(
+            recipe.tags.values_list('name', 'user'),
+            [(tag['name'], self.user.id) for tag in payload['tags']],
+        )
 
     def test_create_recipe_with_existing_tags(self):
         """Test creating a recipe with existing tags"""
         tag1 = create_tag(user=self.user, name="Breakfast")
-        payload = TEST_RECIPE
+        payload = TEST_RECIPE.copy()
         payload['tags'] = [
             {"name": tag1.name},
             {"name": "Heavy"}
@@ -242,11 +263,40 @@ class PrivateRecipeAPITest(TestCase):
         self.assertEqual(recipes.count(), 1)
 
         recipe = recipes.first()
-        self.assertEqual(recipe.tags.count(), 2)
         self.assertIn(tag1, recipe.tags.all())
 
-        for tag in payload['tags']:
-            self.assertIn(Tag.objects.get(name=tag['name'], user=self.user), recipe.tags.all())
+        self.assertCountEqual(
+            recipe.tags.values_list('name', 'user'),
+            [(tag['name'], self.user.id) for tag in payload['tags']],
+        )
+
+    def test_create_recipe_ignores_other_user_tags(self):
+        """Test another user's tag of the same name is never attached"""
+        other_user = create_user(email="other@email.com", password="testPassword")
+        create_tag(user=other_user, name="Lunch")
+        payload = TEST_RECIPE.copy()
+        payload['tags'] = [{"name": "Lunch"}]
+
+        res = self.client.post(RECIPES_URL, payload, format='json')
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        recipe = Recipe.objects.get(pk=res.data['id'])
+        self.assertCountEqual(
+            recipe.tags.values_list('name', 'user'), [("Lunch", self.user.id)]
+        )
+
+    def test_create_recipe_new_tags_keep_payload_order(self):
+        """Test new tags are created in the order they were sent"""
+        payload = TEST_RECIPE.copy()
+        payload['tags'] = [{"name": "Zeta"}, {"name": "Alpha"}, {"name": "Zeta"}]
+
+        res = self.client.post(RECIPES_URL, payload, format='json')
+        self.assertEqual(res.status_code, status.HTTP_201_CREATED)
+
+        tag_names = Tag.objects.filter(user=self.user).order_by('id')
+        self.assertEqual(
+            list(tag_names.values_list('name', flat=True)), ['Zeta', 'Alpha']
+        )
 
     def test_create_tag_on_update(self):
         """Test new tags gets created on update"""
@@ -302,11 +352,10 @@ class PrivateRecipeAPITest(TestCase):
         self.assertEqual(recipes.count(), 1)
 
         recipe = recipes[0]
-        self.assertEqual(recipe.ingredients.count(), 2)
-
-        for ingredient in payload['ingredients']:
-            self.assertTrue(recipe.ingredients.filter(name=ingredient['name'], user=self.user).exists())
-            self.assertIn(Ingredient.objects.get(name=ingredient['name'], user=self.user), recipe.ingredients.all())
+        self.assertCountEqual(
+            recipe.ingredients.values_list('name', 'user'),
+            [(ingredient['name'], self.user.id) for ingredient in payload['ingredients']],
+        )
 
     def test_create_recipe_with_exisiting_ingredients(self):
         """Test creating recipe with existing ingredient assigns the ingredient"""
@@ -321,14 +370,12 @@ class PrivateRecipeAPITest(TestCase):
         self.assertEqual(recipes.count(), 1)
 
         recipe = recipes[0]
-        ingredients = recipe.ingredients.all()
-
-        self.assertEqual(recipe.ingredients.count(), 2)
-        self.assertIn(ingredient1, ingredients)
+        self.assertIn(ingredient1, recipe.ingredients.all())
 
-        for ingredient in payload['ingredients']:
-            self.assertTrue(recipe.ingredients.filter(name=ingredient['name'], user=self.user).exists())
-            self.assertIn(Ingredient.objects.get(name=ingredient['name'], user=self.user), ingredients)
+        self.assertCountEqual(
+            recipe.ingredients.values_list('name', 'user'),
+            [(ingredient['name'], self.user.id) for ingredient in payload['ingredients']],
+        )
 
     def test_create_ingredient_on_update(self):
         """Test that new ingredients are created on update"""
@@ -339,13 +386,10 @@ class PrivateRecipeAPITest(TestCase):
         res = self.client.patch(url, payload, format='json')
         self.assertEqual(res.status_code, status.HTTP_200_OK)
 
-        # recipe.refresh_from_db()
-        self.assertEqual(recipe.ingredients.count(), 2)
-
-        ingredients = recipe.ingredients.all()
-
-        for ingredient in payload['ingredients']:
-            self.assertIn(Ingredient.objects.get(name=ingredient['name'], user=self.user), ingredients)
+        self.assertCountEqual(
+            recipe.ingredients.values_list('name', 'user'),
+            [(ingredient['name'], self.user.id) for ingredient in payload['ingredients']],
+        )
 
     def test_assign_ingredients_on_update(self):
         """Test assigning existing ingredient to a recipe on update"""
@@ -360,11 +404,10 @@ class PrivateRecipeAPITest(TestCase):
         res = self.client.patch(url, payload, format='json')
         self.assertEqual(res.status_code, status.HTTP_200_OK)
 
-        ingredients = recipe.ingredients.all()
-        self.assertEqual(ingredients.count(), 2)
-
-        for ingredient in payload['ingredients']:
-            self.assertIn(Ingredient.objects.get(name=ingredient['name'], user=self.user), ingredients)
+        self.assertCountEqual(
+            recipe.ingredients.values_list('name', 'user'),
+            [(ingredient['name'], self.user.id) for ingredient in payload['ingredients']],
+        )
 
     def test_clear_recipe_ingredients(self):
         """Test clearing recipe ingredients"""
@@ -428,37 +471,45 @@ class PrivateRecipeAPITest(TestCase):
         self.assertIn(s2.data, res.data)
         self.assertNotIn(s3.data, res.data)
 
-    def tearDown(self):
-        drop_tags()
-        drop_users()
-        drop_recipes()
-        drop_ingredients()
-
 
 class RecipeImageUploadTest(TestCase):
     """Test image upload for recipes"""
 
+    client_class = APIClient
+
+    @classmethod
+    def setUpClass(cls):
+        # Keep uploaded test images in RAM when the host has a tmpfs mount
+        cls.media_root = tempfile.mkdtemp(
+            dir="/dev/shm" if os.path.isdir("/dev/shm") else None
+        )
+        cls.addClassCleanup(shutil.rmtree, cls.media_root, ignore_errors=True)
+        cls.media_settings = override_settings(MEDIA_ROOT=cls.media_root)
+        cls.media_settings.enable()
+        cls.addClassCleanup(cls.media_settings.disable)
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(email="example@email.com", password="testPassword")
+
+        image_buffer = io.BytesIO()
+        Image.new('RGB', (10, 10)).save(image_buffer, format="JPEG")
+        cls.jpeg_bytes = image_buffer.getvalue()
+
     def setUp(self):
-        self.client = APIClient()
-        self.user = create_user(email="example@email.com", password="testPassword")
         self.client.force_authenticate(self.user)
         self.recipe = create_recipe(user=self.user)
 
-    def tearDown(self):
-        self.recipe.image.delete()
-        drop_users()
-        drop_recipes()
-
     def test_upload_image(self):
         """Test sucessful image upload for a recipe"""
         url = image_upload_url(self.recipe.id)
 
-        with tempfile.NamedTemporaryFile(suffix=".jpg") as image_file:
-            img = Image.new('RGB', (10, 10))
-            img.save(image_file, format="JPEG")
-            image_file.seek(0)
-            payload = {'image': image_file}
-            res = self.client.post(url, payload, format="multipart")
+        image_file = SimpleUploadedFile(
+            "image.jpg", self.jpeg_bytes, content_type="image/jpeg"
+        )
+        payload = {'image': image_file}
+        res = self.client.post(url, payload, format="multipart")
 
         self.recipe.refresh_from_db()
         self.assertEqual(res.status_code, status.HTTP_200_OK)
@@ -1,35 +1,37 @@
 """Test module for the tags api"""
 
+from functools import lru_cache
+
+from django.core.cache import cache
+from django.db.models import Value
 from django.urls import reverse
-from django.test import TestCase
+from django.test import SimpleTestCase, TestCase, override_settings
 
 from rest_framework import status
 from rest_framework.test import APIClient
 
 from core.models import Tag, Recipe
-from recipe.serializers import TagSerializer
+from recipe.serializers import TagListSerializer
 
 from recipe.tests.utils import (
     create_recipe,
     create_tag,
-    create_user,
-    drop_users,
-    drop_tags,
-    drop_recipes
+    create_user
 )
 
 TAGS_URL = reverse('recipe:tag-list')
+RECIPES_URL = reverse('recipe:recipe-list')
 
 
+@lru_cache(maxsize=None)
 def get_detail_url(tag_id):
     """Constructs and returns the tag detail url"""
     return reverse('recipe:tag-detail', args=[tag_id])
 
 
-class PublicTagTests(TestCase):
+class PublicTagTests(SimpleTestCase):
     """Tests unauthenticated tags API requests"""
-    def setUp(self):
-        self.client = APIClient()
+    client_class = APIClient
 
     def test_auth_required_to_retrieve_tags(self):
         """Tests that retrieving tags unauthenticated fails"""
@@ -37,16 +39,16 @@ class PublicTagTests(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_401_UNAUTHORIZED)
 
-    def tearDown(self):
-        drop_tags()
-        drop_users()
-
 
 class PrivateTagTests(TestCase):
     """Tests authenticated tags API requests"""
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(email='tagtest@email.com', password='Password1234')
+
     def setUp(self):
-        self.user = create_user(email='tagtest@email.com', password='Password1234')
-        self.client = APIClient()
         self.client.force_authenticate(self.user)
 
     def test_retrieve_tags(self):
@@ -54,9 +56,10 @@ class PrivateTagTests(TestCase):
         create_tag(user=self.user, name='Swallow')
         create_tag(user=self.user, name='Dessert')
 
-        res = self.client.get(TAGS_URL)
-        tags = Tag.objects.all().order_by('-name')
-        serializer = TagSerializer(tags, many=True)
+        with self.assertNumQueries(1):
+            res = self.client.get(TAGS_URL)
+        tags = Tag.objects.annotate(is_assigned=Value(False)).order_by('-name')
+        serializer = TagListSerializer(tags, many=True)
 
         self.assertEquals(res.status_code, status.HTTP_200_OK)
         self.assertEqual(res.data, serializer.data)
@@ -97,7 +100,7 @@ class PrivateTagTests(TestCase):
 
         self.assertEqual(res.status_code, status.HTTP_204_NO_CONTENT)
 
-        tag_exists = Tag.objects.filter(id=tag.id).exists()
+        tag_exists = Tag.objects.filter(pk=tag.id).exists()
         self.assertFalse(tag_exists)
 
     def test_filter_assigned(self):
@@ -109,19 +112,35 @@ class PrivateTagTests(TestCase):
         recipe.tags.add(t1)
 
         params = {'assigned_only': 1}
-        res = self.client.get(TAGS_URL, params)
+        with self.assertNumQueries(1):
+            res = self.client.get(TAGS_URL, params)
 
         self.assertEqual(res.status_code, status.HTTP_200_OK)
 
-        s1 = TagSerializer(t1)
-        s2 = TagSerializer(t2)
+        t1.is_assigned, t2.is_assigned = True, False
+        s1 = TagListSerializer(t1)
+        s2 = TagListSerializer(t2)
 
         self.assertIn(s1.data, res.data)
         self.assertNotIn(s2.data, res.data)
 
+    def test_list_flags_assigned_tags(self):
+        """Test the unfiltered list marks which tags are assigned"""
+        breakfast = create_tag(user=self.user, name='Breakfast')
+        create_tag(user=self.user, name='Dinner')
+        recipe = create_recipe(user=self.user, title='Oats')
+        recipe.tags.add(breakfast)
+
+        res = self.client.get(TAGS_URL)
+
+        self.assertEqual(res.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            {tag['name']: tag['is_assigned'] for tag in res.data},
+            {'Breakfast': True, 'Dinner': False},
+        )
+
     def test_unique_filtered_tags(self):
         """Test filtered tags are unique"""
-        drop_tags()
         tag = create_tag(user=self.user, name="Lunch")
         create_tag(user=self.user, name='Brunch')
 
@@ -137,7 +156,55 @@ class PrivateTagTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_200_OK)
         self.assertEqual(len(res.data), 1)
 
-    def tearDown(self):
-        drop_tags()
-        drop_users()
-        drop_recipes()
+
+@override_settings(CACHES={
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}
+})
+class CachedTagListTests(TestCase):
+    """Tests caching of the authenticated tags list"""
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(email='tagcache@email.com', password='Password1234')
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(self.user)
+
+    def test_repeated_list_served_from_cache(self):
+        """Tests that listing tags again doesn't query the database"""
+        create_tag(user=self.user, name='Swallow')
+
+        res = self.client.get(TAGS_URL)
+        with self.assertNumQueries(0):
+            cached_res = self.client.get(TAGS_URL)
+
+        self.assertEqual(cached_res.status_code, status.HTTP_200_OK)
+        self.assertEqual(cached_res.data, res.data)
+
+    def test_update_tag_expires_cached_list(self):
+        """Tests that updating a tag is reflected in the next list"""
+        tag = create_tag(user=self.user, name='Swallow')
+        self.client.get(TAGS_URL)
+
+        self.client.patch(get_detail_url(tag.id), {'name': 'Soup'})
+        res = self.client.get(TAGS_URL)
+
+        self.assertEqual(res.data[0]['name'], 'Soup')
+
+    def test_create_recipe_expires_cached_assigned_list(self):
+        """Tests that assigning a tag through a new recipe is reflected"""
+        params = {'assigned_only': 1}
+        self.assertEqual(self.client.get(TAGS_URL, params).data, [])
+
+        payload = {
+            'title': 'Oats',
+            'time_minutes': 5,
+            'price': '1.50',
+            'tags': [{'name': 'Breakfast'}],
+        }
+        self.client.post(RECIPES_URL, payload, format='json')
+        res = self.client.get(TAGS_URL, params)
+
+        self.assertEqual([tag['name'] for tag in res.data], ['Breakfast'])
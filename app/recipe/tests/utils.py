@@ -2,14 +2,18 @@ from django.contrib.auth import get_user_model
 
 from core.models import Recipe, Tag, Ingredient
 from decimal import Decimal
+from types import MappingProxyType
 
-TEST_RECIPE = {
+User = get_user_model()
+
+# Read only so tests have to copy it before building their own payloads
+TEST_RECIPE = MappingProxyType({
     "title": "Pounded Yam and Efo Riro",
     "time_minutes": 45,
     "price": Decimal("99.99"),
     "description": "Delicious meal",
     "link": "https://www.youtube.com/watch?v=8hMuhCKyhuA",
-}
+})
 
 TEST_USER = {
     "email": "testone@email.com",
@@ -17,29 +21,53 @@ TEST_USER = {
 }
 
 
+def _attach(relation, model, user, items, ignore_conflicts=False):
+    """Adds the named objects to a relation, creating the missing ones in one query"""
+    names = dict.fromkeys(item['name'] for item in items)
+    if not names:
+        return
+
+    existing = set(
+        model.objects.filter(user=user, name__in=names)
+        .values_list('name', flat=True)
+    )
+    model.objects.bulk_create(
+        [model(user=user, name=name) for name in names if name not in existing],
+        ignore_conflicts=ignore_conflicts,
+    )
+    relation.add(*model.objects.filter(user=user, name__in=names))
+
+
 def create_recipe(user, **params):
     """Creates a test recipe with default or given params"""
-    default = TEST_RECIPE.copy()  # Create a copy to avoid modifying the original
-    default.update(params)
+    default = {**TEST_RECIPE, **params}
 
     # Remove tags and ingredients if present since we can't directly assign them
     tags = default.pop('tags', [])
     ingredients = default.pop('ingredients', [])
     recipe = Recipe.objects.create(user=user, **default)
 
-    # Add tags if any were provided
-    for tag in tags:
-        tag_obj, _ = Tag.objects.get_or_create(user=user, **tag)
-        recipe.tags.add(tag_obj)
-
-    # Add ingredients if any were provided
-    for ingredient in ingredients:
-        ingredient_obj, _ = Ingredient.objects.get_or_create(user=user, **ingredient)
-        recipe.ingredients.add(ingredient_obj)
+    _attach(recipe.tags, Tag, user, tags, ignore_conflicts=True)
+    _attach(recipe.ingredients, Ingredient, user, ingredients)
 
     return recipe
 
 
+def create_recipes(user, n, **params):
+    """Creates n test recipes with default or given params in one query"""
+    # bulk_create can't set many to many relations
+    if 'tags' in params or 'ingredients' in params:
+        raise ValueError(
+            'create_recipes cannot assign tags or ingredients, use create_recipe'
+        )
+
+    default = {**TEST_RECIPE, **params}
+
+    return Recipe.objects.bulk_create(
+        [Recipe(user=user, **default) for _ in range(n)]
+    )
+
+
 def create_tag(**params):
     """Creates and returns a new tag"""
     return Tag.objects.create(**params)
@@ -55,24 +83,4 @@ def create_user(**params):
     default = TEST_USER.copy()
     default.update(params)
 
-    return get_user_model().objects.create_user(**default)
-
-
-def drop_users():
-    """Delete all users from the test db"""
-    get_user_model().objects.all().delete()
-
-
-def drop_recipes():
-    """Delete all recipes from the test db"""
-    Recipe.objects.all().delete()
-
-
-def drop_tags():
-    """Delete all tags from the test db"""
-    Tag.objects.all().delete()
-
-
-def drop_ingredients():
-    """Delete all ingredients from the test db"""
-    Ingredient.objects.all().delete()
+    return User.objects.create_user(**default)
@@ -1,11 +1,18 @@
 """Recipe API Views module"""
 
+import uuid
+from collections import defaultdict
+from functools import lru_cache
+
 from rest_framework import viewsets, mixins, status
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.authentication import TokenAuthentication
 from rest_framework.decorators import action
 from rest_framework.response import Response
 
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef, Prefetch
+
 from drf_spectacular.utils import (
     extend_schema,
     extend_schema_view,
@@ -17,6 +24,64 @@ from core.models import Recipe, Tag, Ingredient
 from recipe import serializers
 
 
+_TRUTHY = frozenset({'1', 'true', 'True', 'yes'})
+
+# Seconds a user's serialized tag/ingredient list stays cached
+LIST_CACHE_TIMEOUT = 30
+
+
+def _list_cache_version_key(user):
+    """Returns the cache key holding the version of a user's cached lists"""
+    return f'recipe:list-version:{user.pk}'
+
+
+def _new_list_cache_version():
+    """Returns a version that no cached list has been stored under yet"""
+    return uuid.uuid4().hex
+
+
+def _invalidate_list_cache(user):
+    """Expires every cached tag and ingredient list of a user"""
+    cache.set(_list_cache_version_key(user), _new_list_cache_version(), None)
+
+
+# Many to many relations the list endpoint fetches separately from the rows
+_RECIPE_LIST_RELATIONS = ('tags', 'ingredients')
+
+# Columns of a recipe rendered by the list endpoint, in RecipeSerializer order
+RECIPE_LIST_FIELDS = tuple(
+    name for name in serializers.RecipeSerializer.Meta.fields
+    if name not in _RECIPE_LIST_RELATIONS
+)
+
+# Formats each column exactly like RecipeSerializer does
+_RECIPE_LIST_SERIALIZER_FIELDS = serializers.RecipeSerializer().fields
+
+
+def _names_by_recipe(relation, recipe_ids):
+    """Maps recipe IDs to the id/name dicts of a many to many relation"""
+    if not recipe_ids:
+        return {}
+
+    through = getattr(Recipe, relation).through
+    target = getattr(Recipe, relation).field.m2m_reverse_field_name()
+    rows = through.objects.filter(recipe_id__in=recipe_ids).order_by(
+        f'{target}__id'
+    ).values_list('recipe_id', f'{target}__id', f'{target}__name')
+
+    related = defaultdict(list)
+    for recipe_id, related_id, name in rows:
+        related[recipe_id].append({'id': related_id, 'name': name})
+
+    return related
+
+
+@lru_cache(maxsize=1024)
+def _params_to_ints(qs):
+    """Convert a comma separated string of IDs to a tuple of integers"""
+    return tuple(int(str_id) for str_id in qs.split(','))
+
+
 @extend_schema_view(
     list=extend_schema(
         parameters=[
@@ -36,14 +101,14 @@ from recipe import serializers
 class RecipeViewSet(viewsets.ModelViewSet):
     """Viewset to manage the recipe API"""
     serializer_class = serializers.RecipeDetailSerializer
+    serializer_action_map = {
+        'list': serializers.RecipeSerializer,
+        'upload_image': serializers.RecipeImageSerializer,
+    }
     queryset = Recipe.objects.all()
     authentication_classes = [TokenAuthentication]
     permission_classes = [IsAuthenticated]
 
-    def _params_to_ints(self, qs):
-        """Convert a list of string IDs to a list of integers"""
-        return [int(str_id) for str_id in qs.split(',')]
-
     def get_queryset(self):
         """Overwrites the get method to only return auth user's recipes"""
         queryset = self.queryset
@@ -51,26 +116,68 @@ class RecipeViewSet(viewsets.ModelViewSet):
         ingredients = self.request.query_params.get('ingredients')
 
         if tags:
-            tag_ids = self._params_to_ints(tags)
+            tag_ids = _params_to_ints(tags)
             queryset = queryset.filter(tags__id__in=tag_ids)
         if ingredients:
-            ingredient_ids = self._params_to_ints(ingredients)
+            ingredient_ids = _params_to_ints(ingredients)
             queryset = queryset.filter(ingredients__id__in=ingredient_ids)
 
+        if self.action != 'list':
+            queryset = queryset.prefetch_related(
+                Prefetch('tags', queryset=Tag.objects.only('id', 'name').order_by('id')),
+                Prefetch(
+                    'ingredients',
+                    queryset=Ingredient.objects.only('id', 'name').order_by('id'),
+                ),
+            )
+
         return queryset.filter(user=self.request.user).order_by('-id').distinct()
 
+    def list(self, request, *args, **kwargs):
+        """Lists the authenticated user's recipes"""
+        # Built from plain rows, skipping model and serializer setup
+        rows = list(
+            self.filter_queryset(self.get_queryset()).values(*RECIPE_LIST_FIELDS)
+        )
+        recipe_ids = [row['id'] for row in rows]
+        related = {
+            relation: _names_by_recipe(relation, recipe_ids)
+            for relation in _RECIPE_LIST_RELATIONS
+        }
+
+        recipes = []
+        for row in rows:
+            recipe = {}
+            for name in serializers.RecipeSerializer.Meta.fields:
+                if name in related:
+                    recipe[name] = related[name].get(row['id'], [])
+                elif row[name] is None:
+                    recipe[name] = None
+                else:
+                    field = _RECIPE_LIST_SERIALIZER_FIELDS[name]
+                    recipe[name] = field.to_representation(row[name])
+            recipes.append(recipe)
+
+        return Response(recipes)
+
     def get_serializer_class(self):
         """Returns the appropriate serializer class for a request"""
-        if self.action == 'list':
-            return serializers.RecipeSerializer
-        elif self.action == 'upload_image':
-            return serializers.RecipeImageSerializer
-
-        return self.serializer_class
+        return self.serializer_action_map.get(self.action, self.serializer_class)
 
     def perform_create(self, serializer):
         """Creates a new recipe"""
         serializer.save(user=self.request.user)
+        _invalidate_list_cache(self.request.user)
+
+    def perform_update(self, serializer):
+        """Updates a recipe, which may create or reassign tags/ingredients"""
+        serializer.save()
+        _invalidate_list_cache(self.request.user)
+
+    def perform_destroy(self, instance):
+        """Deletes a recipe, which may unassign tags/ingredients"""
+        instance.delete()
+        _invalidate_list_cache(self.request.user)
 
     @action(methods=['POST'], detail=True, url_path='upload-image')
     def upload_image(self, request, pk=None):
@@ -93,25 +200,63 @@ class BaseRecipeViewSet(mixins.DestroyModelMixin, mixins.UpdateModelMixin,
 
     def get_queryset(self):
         """Filter queries by authenticated user"""
-        assigned_only = bool(
-            int(self.request.query_params.get('assigned_only', 0))
-        )
+        assigned_only = self.request.query_params.get('assigned_only') in _TRUTHY
 
-        queryset = self.queryset
+        # EXISTS stops at the first matching recipe and, unlike joining
+        # through the recipes, never yields duplicates to DISTINCT away
+        queryset = self.queryset.annotate(is_assigned=Exists(
+            Recipe.objects.filter(**{self.recipe_field: OuterRef('pk')})
+        ))
 
         if assigned_only:
-            queryset = queryset.filter(recipe__isnull=False)
+            queryset = queryset.filter(is_assigned=True)
+
+        return queryset.filter(user=self.request.user).order_by('-name')
+
+    def get_serializer_class(self):
+        """Returns the appropriate serializer class for a request"""
+        return self.serializer_action_map.get(self.action, self.serializer_class)
+
+    def list(self, request, *args, **kwargs):
+        """Lists the authenticated user's tags or ingredients"""
+        # Served from cache until the user's lists change or it times out
+        version = cache.get_or_set(
+            _list_cache_version_key(request.user), _new_list_cache_version, None
+        )
+        key = (
+            f'recipe:{self.basename}-list:{request.user.pk}:{version}:'
+            f'{request.query_params.urlencode()}'
+        )
+
+        data = cache.get(key)
+        if data is None:
+            data = super().list(request, *args, **kwargs).data
+            cache.set(key, data, LIST_CACHE_TIMEOUT)
+
+        return Response(data)
+
+    def perform_update(self, serializer):
+        """Updates an object, which renames it in the cached lists"""
+        serializer.save()
+        _invalidate_list_cache(self.request.user)
 
-        return queryset.filter(user=self.request.user).order_by('-name').distinct()
+    def perform_destroy(self, instance):
+        """Deletes an object, which removes it from the cached lists"""
+        instance.delete()
+        _invalidate_list_cache(self.request.user)
 
 
 class TagViewSet(BaseRecipeViewSet):
     """View to manage tags in the database"""
     serializer_class = serializers.TagSerializer
+    serializer_action_map = {'list': serializers.TagListSerializer}
     queryset = Tag.objects.all()
+    recipe_field = 'tags'
 
 
 class IngredientViewSet(BaseRecipeViewSet):
     """View to manage ingredients in the database"""
     serializer_class = serializers.IngredientSerializer
+    serializer_action_map = {'list': serializers.IngredientListSerializer}
     queryset = Ingredient.objects.all()
+    recipe_field = 'ingredients'
@@ -7,6 +7,8 @@ from rest_framework import status
 from rest_framework.test import APIClient
 
 
+User = get_user_model()
+
 CREATE_USER_URL = reverse("user:create")
 TOKEN_URL = reverse("user:token")
 ME_URL = reverse("user:me")
@@ -20,14 +22,13 @@ TEST_USER_DETAILS = {
 
 def create_user(**params):
     """Helper function to create a user"""
-    return get_user_model().objects.create_user(**params)
+    return User.objects.create_user(**params)
 
 
 class PublicUserApiTests(TestCase):
     """Test the users API (public)"""
 
-    def setUp(self):
-        self.client = APIClient()
+    client_class = APIClient
 
     def test_create_valid_user_success(self):
         """Test creating user with valid payload is successful"""
@@ -37,7 +38,7 @@ class PublicUserApiTests(TestCase):
         self.assertEqual(res.status_code, status.HTTP_201_CREATED)
         self.assertNotIn("password", res.data)
 
-        user = get_user_model().objects.get(
+        user = User.objects.get(
             email=payload["email"]
         )  # Fix the get method call
         self.assertTrue(user.check_password(payload["password"]))
@@ -52,13 +53,13 @@ class PublicUserApiTests(TestCase):
 
     def test_password_too_short(self):
         """Test that the password must be more than 5 characters"""
-        payload = TEST_USER_DETAILS
+        payload = TEST_USER_DETAILS.copy()
         payload["password"] = "pass"
 
         res = self.client.post(CREATE_USER_URL, payload)
         self.assertEqual(res.status_code, status.HTTP_400_BAD_REQUEST)
 
-        user_exists = get_user_model().objects.filter(email=payload["email"]).exists()
+        user_exists = User.objects.filter(email=payload["email"]).exists()
 
         self.assertFalse(user_exists)
 
@@ -126,9 +127,13 @@ class PublicUserApiTests(TestCase):
 class PrivateUserAPITest(TestCase):
     """Test API requests that require authentication"""
 
+    client_class = APIClient
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = create_user(**TEST_USER_DETAILS)
+
     def setUp(self):
-        self.user = create_user(**TEST_USER_DETAILS)
-        self.client = APIClient()
         self.client.force_authenticate(user=self.user)
 
     def test_retrieve_user_profile_success(self):